@@ -1,178 +1,672 @@
-import base64, json, os, re
+import atexit, functools, hashlib, json, os, random, re
 from pathlib import Path
 import requests
 import tomllib as tomli  # Python 3.11 'tomllib'
 import yaml
-from jinja2 import Template
-from datetime import datetime, timezone
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from datetime import datetime
 import packaging.version
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # optional: much faster decoding of large API pages
+except ImportError:
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml-backed, when PyYAML was built with it
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 ORG = os.environ.get("ORG","netboxlabs")
 TOKEN = os.environ["GH_TOKEN"]
 HEADERS = {"Authorization": f"Bearer {TOKEN}", "Accept": "application/vnd.github+json"}
+RAW_ACCEPT = "application/vnd.github.raw"
+GRAPHQL_URL = "https://api.github.com/graphql"
+SNAPSHOT_BATCH = 10  # repos per batched GraphQL snapshot query
+
+# Concurrency: repos (and workflows within a repo) are fetched in parallel,
+# but the number of requests in flight is capped to stay clear of GitHub's
+# secondary rate limits.
+MAX_WORKERS = 16
+MAX_IN_FLIGHT = 10
+REGISTRY_WORKERS = 8  # concurrent PyPI/npm lookups per repo
+REGISTRY_IN_FLIGHT = 16  # ...and across all repos
+_gh_semaphore = threading.Semaphore(MAX_IN_FLIGHT)
+_registry_semaphore = threading.Semaphore(REGISTRY_IN_FLIGHT)
+
+# Retries. Backoff bases (seconds) apply when the server gives no wait:
+# GitHub asks for at least a minute after a secondary rate limit; 5xx blips
+# clear faster
+MAX_RETRIES = 4
+SECONDARY_LIMIT_BACKOFF = 60
+SERVER_ERROR_BACKOFF = 1
+RETRY_STATUSES = (500, 502, 503, 504)
+# A primary limit can take up to an hour to reset; past this many seconds
+# it's better to render what we have than to sit out the window
+MAX_RATE_LIMIT_WAIT = int(os.environ.get("MAX_RATE_LIMIT_WAIT", "300"))
+
+# Seconds to wait for a connection or a response before giving up on a request
+REQUEST_TIMEOUT = (10, 30)
+
+# Dropped connections and resets are retried by urllib3 before a response
+# exists; GitHub's retryable statuses are handled in gh_request(). urllib3
+# still treats a 429/503 with Retry-After as retryable, so it must hand the
+# response back rather than raise once its status budget is spent.
+CONNECTION_RETRY = Retry(total=3, connect=3, read=2, status=0, backoff_factor=0.5, raise_on_status=False)
+# The registries have no such handler, so their gateway errors retry here too
+REGISTRY_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), raise_on_status=False)
+
+# Shared session so every GitHub call reuses pooled keep-alive connections,
+# with one pooled connection per request allowed in flight
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=MAX_IN_FLIGHT, max_retries=CONNECTION_RETRY))
+
+# PyPI/npm lookups get their own keep-alive pool (no GitHub auth header),
+# sized so every in-flight lookup can hand its connection back for reuse
+REGISTRY_SESSION = requests.Session()
+REGISTRY_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=REGISTRY_IN_FLIGHT, max_retries=REGISTRY_RETRY))
 
 # Cache for package version lookups to avoid hitting rate limits
 VERSION_CACHE = {}
 
-# Workflows to specifically monitor in the platform-monorepo
-MONITORED_WORKFLOWS = {
-    'integration': [
-        'testsuites_integration_integration.yaml',    # Integration tests
-        'testsuites_integration_sanity.yaml',         # Sanity tests
-        'testsuites_new_netbox_image.yaml'           # NetBox image tests
-    ],
-    'console_ui': [
-        'generated_consoleui_automation_tests.yml',   # ConsoleUI Playwright tests
-        'generated_consoleui_build_and_lint.yml',     # ConsoleUI build/lint
-        'generated_consoleui_unit_tests.yml'         # ConsoleUI unit tests
-    ]
-}
-
-# File paths to check for version information
-VERSION_PATHS = [
+# File paths to check for version information, in priority order. The primary
+# ones are the usual homes of a version; the secondary ones are only probed
+# when none of those has one.
+PRIMARY_VERSION_PATHS = [
     "pyproject.toml",
     "package.json",
     "chart/Chart.yaml",
     "Chart.yaml",
+]
+SECONDARY_VERSION_PATHS = [
     "setup.cfg",
     "setup.py",
     "VERSION",
     "src/netbox/__init__.py",
     "netbox/__init__.py",
 ]
+VERSION_PATHS = PRIMARY_VERSION_PATHS + SECONDARY_VERSION_PATHS
+
+# Version files to try first, by the repo's primary language (from the repo listing)
+LANGUAGE_VERSION_PATHS = {
+    "Python": ["pyproject.toml", "setup.cfg", "setup.py"],
+    "JavaScript": ["package.json"],
+    "TypeScript": ["package.json"],
+    "Go": ["VERSION"],
+    "Smarty": ["chart/Chart.yaml", "Chart.yaml"],  # Helm chart repos
+}
+
+# Version files are small; anything bigger (vendored or generated code that
+# happens to sit at a candidate path) isn't downloaded just to be scanned
+MAX_VERSION_FILE_SIZE = 64 * 1024
 
-# Heuristics: what looks like tests vs. non-test infra
-TEST_WORKFLOW_RE = re.compile(r"(test|tests|pytest|unit|integration|e2e|ci|TestSuites)", re.I)
-NON_TEST_HINT = re.compile(r"(doc|docs|page|pages|website|release|docker|publish|deploy|package|lint|format|codeql)", re.I)
+# Version assignments in setup.cfg/setup.py/VERSION and __init__.py files
+VERSION_ASSIGN_RE = re.compile(r"\bversion\s*[:=]\s*['\"]([^'\"]+)['\"]", re.I)
+DUNDER_VERSION_RE = re.compile(r"__version__\s*=\s*['\"]([^'\"]+)['\"]")
+
+# [project] table of a pyproject.toml and its version key, tried before a full TOML parse
+PROJECT_TABLE_RE = re.compile(r"(?ms)^\[project\][ \t]*$(.*?)(?=^\[|\Z)")
+PROJECT_VERSION_RE = re.compile(r"(?m)^[ \t]*version[ \t]*=[ \t]*[\"']([^\"'\n]+)[\"']")
+
+# Top-level "version:" key of a Chart.yaml, tried before a full YAML parse
+CHART_VERSION_RE = re.compile(r"(?m)^version:\s*['\"]?([^'\"#\s]+)")
+
+# Last page number in a Link header (rel="last" is only sent when there's more than one)
+LINK_LAST_RE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# Requirement strings (e.g., "requests>=2.25.1") -> name, version
+REQUIREMENT_RE = re.compile(r"([^<>=~!]+)(?:[<>=~!]+([^,]+))?")
+
+# Repos without a push in this many days are treated as having no recent CI
+STALE_AFTER_DAYS = int(os.environ.get("STALE_DAYS", "90"))
+
+# Heuristics: what looks like tests vs. non-test infra. These are plain
+# case-insensitive substrings, so "test" also covers tests/pytest/TestSuites,
+# "doc" covers docs, and "page" covers pages.
+TEST_KEYWORDS = ("test", "unit", "integration", "e2e", "ci")
+NON_TEST_KEYWORDS = ("doc", "page", "website", "release", "docker", "publish", "deploy",
+                     "package", "lint", "format", "codeql")
 
 # Cache for GitHub API responses
 _gh_cache = {}
 
-def gh(url, params=None):
-    """Make a GitHub API request with auth token."""
-    cache_key = f"{url}:{str(params)}"
+# Caches kept between runs live under .cache/ (restored by the workflow)
+CACHE_DIR = Path(".cache")
+
+def json_loads(data):
+    """Parse a JSON body (bytes or str), using orjson when it's installed."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(data):
+    """Serialize to UTF-8 JSON bytes, using orjson when it's installed."""
+    return orjson.dumps(data) if orjson else json.dumps(data).encode("utf-8")
+
+def load_json_cache(path):
+    """Load a cache file written by a previous run, if any."""
+    try:
+        return json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+def save_json_cache(path, data):
+    """Atomically persist a cache file for the next run."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(json_dumps(data))
+    os.replace(tmp_path, path)
+
+# Conditional-request cache: "url:params" -> [etag, body, fetched_at].
+# A 304 reply returns no body and doesn't count against the rate limit.
+ETAG_CACHE_PATH = CACHE_DIR / "etag-cache.json"
+_etag_cache = load_json_cache(ETAG_CACHE_PATH)
+
+# Entries not used for this long (e.g. check runs of old commits) are dropped
+# when the cache is saved, so the file doesn't grow without bound
+ETAG_CACHE_MAX_AGE = 7 * 86400
+
+# File contents rarely change between back-to-back runs, so a cached body
+# this young is used as-is instead of being revalidated
+CONTENTS_MAX_AGE = int(os.environ.get("CONTENTS_MAX_AGE", "300"))
+# The same goes, for longer, for listings that change on a scale of days:
+# the org's repos and each repo's workflow definitions
+REPOS_MAX_AGE = int(os.environ.get("REPOS_MAX_AGE", str(6 * 3600)))
+WORKFLOWS_MAX_AGE = int(os.environ.get("WORKFLOWS_MAX_AGE", "3600"))
+
+# Default branches rarely change: "owner/repo" -> {default_branch, expires_at}
+BRANCH_CACHE_PATH = CACHE_DIR / "gh-cache.json"
+BRANCH_CACHE_TTL = 3600
+_branch_cache = load_json_cache(BRANCH_CACHE_PATH)
+
+# Jobs of a completed run never change: "run_id:attempt" -> trimmed jobs list.
+# Only entries used by this run are written back, so the file doesn't grow.
+JOBS_CACHE_PATH = CACHE_DIR / "jobs-cache.json"
+JOB_FIELDS = ("name", "status", "conclusion", "html_url", "url", "completed_at", "started_at")
+_previous_jobs_cache = load_json_cache(JOBS_CACHE_PATH)
+_jobs_cache = {}
+
+# Versions read from files at a commit: "owner/repo@sha:language" -> [version, path]
+# ([] when no version file exists). Pruned to this run's entries like the jobs cache.
+VERSION_CACHE_PATH = CACHE_DIR / "version-cache.json"
+_previous_version_cache = load_json_cache(VERSION_CACHE_PATH)
+_version_cache = {}
+
+# Version parsed from a blob: "blob_sha:file name" -> version (or null). This
+# survives pushes that don't touch version files, unlike the per-commit cache.
+# Runs served from the per-commit cache use no blobs, so entries aren't pruned
+# to this run's; the least recently used are dropped past the size cap.
+BLOB_VERSION_CACHE_PATH = CACHE_DIR / "blob-version-cache.json"
+BLOB_VERSION_CACHE_MAX = 5000
+_previous_blob_version_cache = load_json_cache(BLOB_VERSION_CACHE_PATH)
+_blob_version_cache = {}
+
+@atexit.register
+def save_caches():
+    """Flush the on-disk caches when the script exits."""
+    cutoff = time.time() - ETAG_CACHE_MAX_AGE
+    save_json_cache(ETAG_CACHE_PATH, {k: v for k, v in _etag_cache.items() if len(v) > 2 and v[2] > cutoff})
+    save_json_cache(BRANCH_CACHE_PATH, _branch_cache)
+    save_json_cache(JOBS_CACHE_PATH, _jobs_cache)
+    save_json_cache(VERSION_CACHE_PATH, _version_cache)
+    # Entries used this run go last, so the oldest are the ones cut off
+    blobs = {k: v for k, v in _previous_blob_version_cache.items() if k not in _blob_version_cache}
+    blobs.update(_blob_version_cache)
+    save_json_cache(BLOB_VERSION_CACHE_PATH, dict(list(blobs.items())[-BLOB_VERSION_CACHE_MAX:]))
+
+def yaml_load(data):
+    """Parse a YAML document, using the C loader when it's available."""
+    return yaml.load(data, Loader=YamlLoader)
+
+def backoff(base, attempt):
+    """Exponential backoff from `base`, plus jitter so parallel workers don't retry in lockstep."""
+    return base * 2 ** attempt + random.uniform(0, base)
+
+def retry_wait(r, attempt):
+    """Seconds to wait before retrying a response, or None if it shouldn't be retried."""
+    if r.status_code in RETRY_STATUSES:
+        return backoff(SERVER_ERROR_BACKOFF, attempt)
+    if r.status_code not in (403, 429):
+        return None
+    retry_after = r.headers.get("Retry-After")
+    if retry_after:
+        return float(retry_after)
+    if r.headers.get("X-RateLimit-Remaining") == "0":
+        reset = int(r.headers.get("X-RateLimit-Reset", "0"))
+        return max(reset - time.time(), 0) + 1
+    # Secondary rate limits don't always send headers; a plain 403 is access denied.
+    # Our own backoff stays within the wait cap so the last retry isn't dropped.
+    if b"rate limit" in r.content.lower():
+        return min(backoff(SECONDARY_LIMIT_BACKOFF, attempt), MAX_RATE_LIMIT_WAIT)
+    return None
+
+def gh_get(url, params=None, headers=None):
+    """GET through the shared session, honoring GitHub's rate-limit headers."""
+    return gh_request("GET", url, params=params, headers=headers)
+
+# When one request is told to back off from a rate limit, every worker
+# holds off until then instead of being rejected in turn
+_rate_limit_lock = threading.Lock()
+_rate_limited_until = 0.0
+
+def hold_requests(seconds):
+    """Pause all GitHub requests for `seconds` from now."""
+    global _rate_limited_until
+    with _rate_limit_lock:
+        _rate_limited_until = max(_rate_limited_until, time.time() + seconds)
+
+def gh_request(method, url, **kwargs):
+    """Send a request through the shared session, retrying rate limits and 5xx errors."""
+    for attempt in range(MAX_RETRIES):
+        pause = _rate_limited_until - time.time()
+        if pause > 0:
+            time.sleep(pause)
+        with _gh_semaphore:
+            r = SESSION.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+        wait = retry_wait(r, attempt)
+        if wait is None or attempt == MAX_RETRIES - 1:
+            break
+        if wait > MAX_RATE_LIMIT_WAIT:
+            print(f"Got {r.status_code} on {url}, not waiting {wait:.0f}s for the rate limit to reset")
+            break
+        print(f"Got {r.status_code} on {url}, retrying in {wait:.0f}s")
+        if r.status_code in (403, 429):
+            hold_requests(wait)
+        time.sleep(wait)
+    return r
+
+def cache_max_age(url):
+    """Seconds a cached body for url is used without revalidating it."""
+    if "/contents/" in url:
+        return CONTENTS_MAX_AGE
+    if url.endswith("/actions/workflows"):
+        return WORKFLOWS_MAX_AGE
+    if url.endswith("/repos") and ("/orgs/" in url or url.endswith("/user/repos")):
+        return REPOS_MAX_AGE
+    return 0
+
+def gh_cache_key(url, params=None, raw=False):
+    """Key of a gh() call in _gh_cache and the ETag cache."""
+    return f"{url}:{str(params)}" + (":raw" if raw else "")
+
+def gh_missing(url, params=None, raw=False):
+    """True if gh() got a 404/409 for this call, rather than failing to fetch it."""
+    key = gh_cache_key(url, params, raw)
+    return key in _gh_cache and _gh_cache[key] is None
+
+def gh(url, params=None, raw=False):
+    """Make a GitHub API request with auth token.
+
+    With raw=True the body is requested with the raw media type and returned
+    as text (used for file contents, skipping the JSON + base64 wrapping).
+    """
+    cache_key = gh_cache_key(url, params, raw)
     if cache_key in _gh_cache:
         return _gh_cache[cache_key]
     
     try:
         print(f"DEBUG: Requesting {url}")  # Debug line
-        r = requests.get(url, headers=HEADERS, params=params)
-        r.raise_for_status()
-        data = r.json()
+        cached = _etag_cache.get(cache_key)
+        if cached and len(cached) > 2 and time.time() - cached[2] < cache_max_age(url):
+            _gh_cache[cache_key] = cached[1]
+            return cached[1]
+        headers = {"Accept": RAW_ACCEPT} if raw else {}
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        r = gh_get(url, params=params, headers=headers)
+        if r.status_code == 304 and cached:
+            data = cached[1]
+            _etag_cache[cache_key] = [cached[0], data, time.time(), *cached[3:]]
+        else:
+            r.raise_for_status()
+            data = r.content.decode("utf-8") if raw else json_loads(r.content)
+            if r.headers.get("ETag"):
+                entry = [r.headers["ETag"], data, time.time()]
+                # Paginated listings also keep their page count for gh_pages()
+                last = LINK_LAST_RE.search(r.headers.get("Link", ""))
+                if last:
+                    entry.append(int(last.group(1)))
+                _etag_cache[cache_key] = entry
         _gh_cache[cache_key] = data
         return data
     except requests.exceptions.HTTPError as e:
+        wait = retry_wait(e.response, 0) if e.response.status_code in (403, 429) else None
+        if wait is not None:
+            # gh_request() either waited this out MAX_RETRIES times or wouldn't
+            # wait that long at all; give up on this call rather than the whole
+            # build, and don't call it "access denied"
+            if wait > MAX_RATE_LIMIT_WAIT:
+                print(f"Warning: Rate limit resets in {wait:.0f}s, past MAX_RATE_LIMIT_WAIT; skipping {url}")
+            else:
+                print(f"Warning: Still rate limited after {MAX_RETRIES} attempts, skipping {url}")
+            return None
         if e.response.status_code in (403, 404, 409):
             # For restricted, not found, or conflict repos, log warning and return None
             repo_name = url.split("/repos/")[-1].split("/")[1] if "/repos/" in url else "unknown"
             status_map = {403: "Access denied", 404: "Not found", 409: "Conflict"}
             print(f"Warning: {status_map[e.response.status_code]} for repo {repo_name} ({e.response.status_code})")
             print(f"DEBUG: Full URL that failed: {url}")  # Debug line
+            if e.response.status_code != 403:
+                # Missing files and empty repos stay that way for the run;
+                # remember the miss so other probes of the same path are free
+                _gh_cache[cache_key] = None
             return None
         raise
 
+def gh_pages(url, params, key=None):
+    """Every item of a paginated listing, or None if its first page failed.
+
+    Page 1 names the last page in its Link header, so the remaining pages
+    are fetched all at once rather than one after another. `key` picks the
+    list out of wrapped pages (e.g. "workflows").
+    """
+    def page_items(data):
+        return (data or {}).get(key, []) if key else data or []
+
+    per_page = params.get("per_page", 30)
+    first_params = {**params, "page": 1}
+    first = gh(url, params=first_params)
+    if first is None:
+        return None
+    items = list(page_items(first))
+    page, batch = 1, items
+    cached = _etag_cache.get(gh_cache_key(url, first_params))
+    if cached and len(cached) > 3:
+        pages = range(2, cached[3] + 1)
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pages) or 1)) as executor:
+            for page, data in zip(pages, executor.map(lambda p: gh(url, params={**params, "page": p}), pages)):
+                batch = page_items(data)
+                items.extend(batch)
+    # Walk on while the last page is full: with no page count known (no Link
+    # header, or an old cache entry), and also when the count is stale, as
+    # when page 1 answered 304 but the listing has grown a page since
+    while len(batch) >= per_page:
+        page += 1
+        batch = page_items(gh(url, params={**params, "page": page}))
+        items.extend(batch)
+    return items
+
+def gh_graphql(query):
+    """Run a GraphQL query; returns its data, or None if the API refused it."""
+    try:
+        r = gh_request("POST", GRAPHQL_URL, data=json_dumps({"query": query}),
+                       headers={"Content-Type": "application/json"})
+        r.raise_for_status()
+        body = json_loads(r.content)
+    except Exception as e:
+        print(f"Warning: GraphQL request failed: {e}")
+        return None
+    # Partial errors (e.g. one missing object) still come with usable data
+    return body.get("data")
+
+# Fields read for every repo snapshot, shared by all aliases of a batched query
+SNAPSHOT_FRAGMENT = """fragment snapshot on Repository {
+  defaultBranchRef { name target { oid ... on Commit {
+    checkSuites(first: 20) { pageInfo { hasNextPage } nodes { checkRuns(first: 50, filterBy: {checkType: LATEST}) {
+      pageInfo { hasNextPage } nodes { name status conclusion permalink startedAt completedAt }
+    } } }
+  } } }
+  refs(refPrefix: "refs/tags/", first: 1, orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) { nodes { name } }
+%s
+}""" % "\n".join(
+    f'  f{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ oid byteSize text }} }}'
+    for i, path in enumerate(VERSION_PATHS)
+)
+
+# "owner/repo" -> snapshot dict, or None once GraphQL has answered without one
+_snapshots = {}
+
+def parse_snapshot(node):
+    """Turn a repository node of SNAPSHOT_FRAGMENT into a snapshot dict, or None."""
+    if not node or not node.get("defaultBranchRef"):
+        return None
+    tags = (node.get("refs") or {}).get("nodes") or []
+    target = node["defaultBranchRef"]["target"]
+    check_runs = None  # a token without checks access gets no suites back
+    suites = target.get("checkSuites")
+    # One suite per workflow run, so a busy commit can outgrow a page; those
+    # are left to the REST listing, which returns the latest runs
+    truncated = suites and ((suites.get("pageInfo") or {}).get("hasNextPage") or any(
+        (((suite or {}).get("checkRuns") or {}).get("pageInfo") or {}).get("hasNextPage")
+        for suite in suites.get("nodes") or []))
+    if suites and not truncated:
+        # Same shape as the REST check-runs listing
+        check_runs = [
+            {"name": cr.get("name", ""),
+             "status": (cr.get("status") or "").lower() or None,
+             "conclusion": (cr.get("conclusion") or "").lower() or None,
+             "html_url": cr.get("permalink"),
+             "started_at": cr.get("startedAt"),
+             "completed_at": cr.get("completedAt")}
+            for suite in suites.get("nodes") or []
+            for cr in ((suite or {}).get("checkRuns") or {}).get("nodes") or []
+        ]
+    return {
+        "default_branch": node["defaultBranchRef"]["name"],
+        "head_sha": target["oid"],
+        "check_runs": check_runs,
+        "latest_tag": tags[0]["name"] if tags else None,
+        # Oversized files are skipped here as on the REST path
+        "files": {path: node[f"f{i}"]["text"] for i, path in enumerate(VERSION_PATHS)
+                  if node.get(f"f{i}") and node[f"f{i}"].get("text") is not None
+                  and (node[f"f{i}"].get("byteSize") or 0) <= MAX_VERSION_FILE_SIZE},
+        "blobs": {path: node[f"f{i}"].get("oid") for i, path in enumerate(VERSION_PATHS)
+                  if node.get(f"f{i}")},
+    }
+
+def fetch_snapshots(owner, repos):
+    """Snapshot several repos with one aliased GraphQL query (r0, r1, ...)."""
+    selections = "\n".join(
+        f'  r{i}: repository(owner: "{owner}", name: "{repo}") {{ ...snapshot }}'
+        for i, repo in enumerate(repos)
+    )
+    data = gh_graphql(f"query {{\n{selections}\n}}\n{SNAPSHOT_FRAGMENT}") or {}
+    for i, repo in enumerate(repos):
+        _snapshots[f"{owner}/{repo}"] = parse_snapshot(data.get(f"r{i}"))
+
+def prefetch_snapshots(owner, repos):
+    """Snapshot all of `repos` up front, SNAPSHOT_BATCH repos per query."""
+    repos = [repo for repo in repos if f"{owner}/{repo}" not in _snapshots]
+    batches = [repos[i:i + SNAPSHOT_BATCH] for i in range(0, len(repos), SNAPSHOT_BATCH)]
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(batches) or 1)) as executor:
+        list(executor.map(lambda batch: fetch_snapshots(owner, batch), batches))
+
+def repo_snapshot(owner, repo):
+    """Default branch, HEAD oid, newest tag and version files of a repo.
+
+    Served from prefetch_snapshots() when the repo was part of a batch.
+    Returns None when GraphQL can't answer (no access, empty repo, API error),
+    in which case callers fall back to the REST endpoints.
+    """
+    key = f"{owner}/{repo}"
+    if key not in _snapshots:
+        fetch_snapshots(owner, [repo])
+    return _snapshots.get(key)
+
+def branch_snapshot(owner, repo, ref):
+    """repo_snapshot() if it describes `ref`, else None (e.g. a non-default branch)."""
+    snapshot = repo_snapshot(owner, repo)
+    return snapshot if snapshot and snapshot["default_branch"] == ref else None
+
+@functools.lru_cache(maxsize=4096)
 def get_head_sha(owner, repo, ref):
     """Get the SHA of the HEAD commit."""
     data = gh(f"https://api.github.com/repos/{owner}/{repo}/commits/{ref}")
     return data.get("sha") if data else None
 
+@functools.lru_cache(maxsize=8192)
+def classify(name):
+    """Classify a workflow/job/check name as "test", "nontest" or None.
+
+    A non-test hint anywhere in the name wins over a test hint.
+    """
+    lowered = name.lower()
+    if any(kw in lowered for kw in NON_TEST_KEYWORDS):
+        return "nontest"
+    if any(kw in lowered for kw in TEST_KEYWORDS):
+        return "test"
+    return None
+
+# Conclusions are only set once a run has completed, so a single table
+# keyed by conclusion or status gives the same order as checking each in turn
+PRIORITY = {
+    "failure": 0, "timed_out": 0, "cancelled": 0, "action_required": 0,
+    "in_progress": 1, "queued": 1,
+    "success": 3,
+}
+
+# Card colour for the most specific state a run reports
+CARD_CLASSES = {
+    "success": "success",
+    "failure": "failure", "timed_out": "failure", "cancelled": "failure", "action_required": "failure",
+    "in_progress": "pending", "queued": "pending", "pending": "pending",
+    "stale": "stale",
+}
+
+def card_class(state):
+    """CSS class of a repo card for an overall state (conclusion or status)."""
+    return CARD_CLASSES.get(state, "unknown")
+
 def priority(status, conclusion):
     """Priority order for test status (lower = higher priority/worse)."""
-    if conclusion in ("failure","timed_out","cancelled","action_required"):
+    return PRIORITY.get(conclusion, PRIORITY.get(status, 2))  # 2 = neutral/unknown
+
+def iso_to_epoch(ts):
+    """GitHub ISO-8601 timestamp -> integer epoch seconds (0 when missing)."""
+    if not ts:
         return 0
-    if status in ("in_progress","queued"):
-        return 1
-    if conclusion == "success":
-        return 3
-    return 2  # neutral/unknown
+    return int(datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp())
 
+@functools.lru_cache(maxsize=4096)
 def default_branch(owner, repo):
     """Get the default branch of a repo."""
+    key = f"{owner}/{repo}"
+    entry = _branch_cache.get(key)
+    if entry and entry["expires_at"] > time.time():
+        return entry["default_branch"]
+
     r = gh(f"https://api.github.com/repos/{owner}/{repo}")
-    return r.get("default_branch","main") if r else None
+    branch = r.get("default_branch","main") if r else None
+    if branch:
+        _branch_cache[key] = {"default_branch": branch, "expires_at": time.time() + BRANCH_CACHE_TTL}
+    return branch
 
-def get_workflow_runs(owner, repo, workflow_id):
-    """Get the latest run for a specific workflow."""
+@functools.lru_cache(maxsize=None)
+def classic_token_scopes():
+    """OAuth scopes of a classic PAT, or None for fine-grained and app tokens."""
     try:
-        url = f"https://api.github.com/repos/{owner}/{repo}/actions/workflows/{workflow_id}/runs"
-        data = gh(url, params={"per_page": 1, "branch": "develop"})
-        if data and data.get("workflow_runs"):
-            latest_run = data["workflow_runs"][0]
-            return {
-                "status": latest_run["conclusion"] or latest_run["status"],
-                "url": latest_run["html_url"],
-                "updated_at": latest_run["updated_at"],
-                "name": latest_run["name"]
-            }
-    except Exception as e:
-        print(f"Error fetching workflow {workflow_id} for {owner}/{repo}: {e}")
-    return None
+        r = gh_request("HEAD", "https://api.github.com/user")
+    except requests.exceptions.RequestException:
+        return None
+    scopes = r.headers.get("X-OAuth-Scopes")  # only classic tokens report scopes
+    if r.status_code != 200 or scopes is None:
+        return None
+    return {scope.strip() for scope in scopes.split(",") if scope.strip()}
 
 def list_repos(org):
     """Return all repos visible to the token, including private org repos."""
-    repos, page = [], 1
-    # Org endpoint
-    while True:
-        data = gh(f"https://api.github.com/orgs/{org}/repos",
-                  params={"per_page": 100, "page": page, "type": "all", "sort": "full_name"})
-        if not data:
-            # If we get None (403 forbidden), try the user endpoint
-            break
-        repos.extend(data)
-        page += 1
-    
+    repos = {}  # id -> repo, so both listings merge without duplicates
+    # Org endpoint; if we get None (403 forbidden), try the user endpoint
+    for r in gh_pages(f"https://api.github.com/orgs/{org}/repos",
+                      {"per_page": 100, "type": "all", "sort": "full_name"}) or []:
+        repos.setdefault(r["id"], r)
+
+    # Both listings are gated by the same scopes for a classic PAT (repo,
+    # read:org or none at all), so once the org endpoint answered, the user
+    # endpoint only adds to fine-grained tokens; don't page through it for nothing
+    if repos and classic_token_scopes() is not None:
+        return list(repos.values())
+
     # If org endpoint failed or to complement it, try user endpoint
-    names = {r["name"] for r in repos}
-    page = 1
-    while True:
-        data = gh("https://api.github.com/user/repos",
-                  params={"per_page": 100, "page": page, "affiliation": "organization_member"})
-        if not data:
-            break
-        for r in data:
-            if r.get("owner", {}).get("login", "").lower() == org.lower() and r["name"] not in names:
-                repos.append(r)
-                names.add(r["name"])
-        page += 1
+    for r in gh_pages("https://api.github.com/user/repos",
+                      {"per_page": 100, "affiliation": "organization_member"}) or []:
+        if r.get("owner", {}).get("login", "").lower() == org.lower():
+            repos.setdefault(r["id"], r)
     
     # If we have no repos at all, something's wrong with the token
     if not repos:
         print(f"Warning: No repositories found for organization {org}. Check your GitHub token permissions.")
     
-    return repos
+    return list(repos.values())
+
+# Returned by read_file_version() when the file couldn't be fetched (rate
+# limit, timeout, 5xx), as opposed to missing or holding no version; such a
+# result says nothing about the file and must not be cached
+FETCH_FAILED = object()
 
 def read_file_version(owner, repo, path, ref):
-    """Extract version info from various file types."""
+    """Extract version info from various file types, or FETCH_FAILED."""
     url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
     try:
-        data = gh(url, params={"ref": ref})
-        content = base64.b64decode(data["content"]).decode("utf-8")
+        content = gh(url, params={"ref": ref}, raw=True)
+    except Exception:
+        return FETCH_FAILED
+    if content is None and not gh_missing(url, params={"ref": ref}, raw=True):
+        return FETCH_FAILED
+    return parse_version_file(path, content)
+
+def pyproject_version(content):
+    """[project] version of a pyproject.toml."""
+    table = PROJECT_TABLE_RE.search(content)
+    m = table and PROJECT_VERSION_RE.search(table.group(1))
+    if m:
+        return m.group(1)
+    try:
+        return tomli.loads(content).get("project",{}).get("version")
     except Exception:
         return None
-    if path.endswith("pyproject.toml"):
-        try:
-            v = tomli.loads(content).get("project",{}).get("version")
-            return v
-        except Exception:
-            return None
-    if path.endswith("package.json"):
-        try:
-            return json.loads(content).get("version")
-        except Exception:
-            return None
-    if path.lower().endswith("chart.yaml"):
-        try:
-            return yaml.safe_load(content).get("version")
-        except Exception:
-            return None
-    if path.endswith(("setup.cfg","setup.py","VERSION")):
-        m = re.search(r"\bversion\s*[:=]\s*['\"]([^'\"]+)['\"]", content, re.I)
-        return m.group(1) if m else content.strip() if path.endswith("VERSION") else None
-    if path.endswith("__init__.py"):
-        m = re.search(r"__version__\s*=\s*['\"]([^'\"]+)['\"]", content)
-        return m.group(1) if m else None
-    return None
+
+def package_json_version(content):
+    """Top-level version of a package.json."""
+    try:
+        return json_loads(content).get("version")
+    except Exception:
+        return None
+
+def chart_version(content):
+    """Top-level version of a Helm Chart.yaml."""
+    m = CHART_VERSION_RE.search(content)
+    if m:
+        return m.group(1)
+    try:
+        return yaml_load(content).get("version")
+    except Exception:
+        return None
+
+def assigned_version(content):
+    """version = "..." / version: "..." as found in setup.cfg and setup.py."""
+    m = VERSION_ASSIGN_RE.search(content)
+    return m.group(1) if m else None
+
+def plain_version(content):
+    """A VERSION file: an assignment if there is one, else the whole text."""
+    return assigned_version(content) or content.strip()
+
+def dunder_version(content):
+    """__version__ = "..." in a package __init__.py."""
+    m = DUNDER_VERSION_RE.search(content)
+    return m.group(1) if m else None
+
+# Version file parsers by lowercased file name
+VERSION_PARSERS = {
+    "pyproject.toml": pyproject_version,
+    "package.json": package_json_version,
+    "chart.yaml": chart_version,
+    "setup.cfg": assigned_version,
+    "setup.py": assigned_version,
+    "version": plain_version,
+    "__init__.py": dunder_version,
+}
+
+def parse_version_file(path, content):
+    """Pull the version out of a version file's text, or None."""
+    if content is None:
+        return None
+    parser = VERSION_PARSERS.get(path.rsplit("/", 1)[-1].lower())
+    return parser(content) if parser else None
 
 def get_latest_pypi_version(package_name):
     """Get the latest version of a package from PyPI."""
@@ -181,11 +675,12 @@ def get_latest_pypi_version(package_name):
         return VERSION_CACHE[cache_key]
     
     try:
-        r = requests.get(f"https://pypi.org/pypi/{package_name}/json")
+        with _registry_semaphore:
+            r = REGISTRY_SESSION.get(f"https://pypi.org/pypi/{package_name}/json", timeout=REQUEST_TIMEOUT)
         if r.status_code == 404:
             return None
         r.raise_for_status()
-        data = r.json()
+        data = json_loads(r.content)
         version = data["info"]["version"]
         VERSION_CACHE[cache_key] = version
         return version
@@ -200,11 +695,12 @@ def get_latest_npm_version(package_name):
         return VERSION_CACHE[cache_key]
     
     try:
-        r = requests.get(f"https://registry.npmjs.org/{package_name}/latest")
+        with _registry_semaphore:
+            r = REGISTRY_SESSION.get(f"https://registry.npmjs.org/{package_name}/latest", timeout=REQUEST_TIMEOUT)
         if r.status_code == 404:
             return None
         r.raise_for_status()
-        data = r.json()
+        data = json_loads(r.content)
         version = data["version"]
         VERSION_CACHE[cache_key] = version
         return version
@@ -252,11 +748,11 @@ def get_helm_dependencies(owner, repo, ref):
     for chart_path in chart_paths:
         try:
             print(f"  Checking {chart_path}")
-            chart_yaml = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/{chart_path}", params={"ref": ref})
+            chart_yaml = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/{chart_path}", params={"ref": ref}, raw=True)
             if chart_yaml:
                 print(f"  Found {chart_path}")
-                content = yaml.safe_load(base64.b64decode(chart_yaml["content"]).decode("utf-8"))
-                print(f"  Chart content: {json.dumps(content, indent=2)}")
+                content = yaml_load(chart_yaml)
+                print(f"  Chart content: {json_dumps(content).decode('utf-8')}")
                 
                 # Check dependencies section in Chart.yaml
                 deps = content.get("dependencies", [])
@@ -272,7 +768,8 @@ def get_helm_dependencies(owner, repo, ref):
                         print(f"    Repository URL: {repo_url}")
                         
                         # Try to extract dependency name from various formats
-                        if "oci://" in repo_url.lower() or "registry" in repo_url.lower():
+                        repo_url_lower = repo_url.lower()
+                        if "oci://" in repo_url_lower or "registry" in repo_url_lower:
                             # For OCI/registry references, use the chart name
                             clean_name = clean_repo_name(repo_name)
                             if clean_name:
@@ -316,13 +813,12 @@ def discover_repo_dependencies(owner, repo, ref):
 
     # Check submodules
     try:
-        submodules = gh(f"https://api.github.com/repos/{owner}/{repo}/git/trees/{ref}?recursive=1")
+        submodules = gh(f"https://api.github.com/repos/{owner}/{repo}/git/trees/{ref}", params={"recursive": 1})
         if submodules and submodules.get("tree"):
             for item in submodules["tree"]:
                 if item["path"].endswith(".gitmodules"):
-                    content = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/{item['path']}", params={"ref": ref})
-                    if content:
-                        decoded = base64.b64decode(content["content"]).decode("utf-8")
+                    decoded = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/{item['path']}", params={"ref": ref}, raw=True)
+                    if decoded:
                         # Parse submodule URLs
                         for line in decoded.splitlines():
                             if "url =" in line:
@@ -338,10 +834,9 @@ def discover_repo_dependencies(owner, repo, ref):
         workflows = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/.github/workflows", params={"ref": ref})
         if workflows:
             for workflow in workflows:
-                content = gh(workflow["url"])
-                if content:
-                    decoded = base64.b64decode(content["content"]).decode("utf-8")
-                    yaml_content = yaml.safe_load(decoded)
+                decoded = gh(workflow["url"], raw=True)
+                if decoded:
+                    yaml_content = yaml_load(decoded)
                     
                     # Check uses statements in workflows
                     def scan_uses(obj):
@@ -363,9 +858,9 @@ def discover_repo_dependencies(owner, repo, ref):
 
     # Check package.json repository dependencies
     try:
-        package_json = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/package.json", params={"ref": ref})
+        package_json = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/package.json", params={"ref": ref}, raw=True)
         if package_json:
-            content = json.loads(base64.b64decode(package_json["content"]).decode("utf-8"))
+            content = json_loads(package_json)
             deps = content.get("dependencies", {})
             dev_deps = content.get("devDependencies", {})
             
@@ -385,7 +880,7 @@ def get_repo_dependencies(owner, repo, ref):
     # Try loading from config file
     try:
         with open("repo-dependencies.yml") as f:
-            config = yaml.safe_load(f)
+            config = yaml_load(f)
             repo_config = config.get("repositories", {}).get(repo, {})
             dependencies.update(repo_config.get("dependencies", []))
     except Exception as e:
@@ -403,108 +898,225 @@ def get_dependencies(owner, repo, ref):
         "node": [],
         "repos": []
     }
-    
-    # Check cross-repo dependencies
-    repo_deps = get_repo_dependencies(owner, repo, ref)
-    for dep_repo in repo_deps:
-        # Get the status of the dependent repo
-        dep_branch = default_branch(owner, dep_repo)
-        if dep_branch:  # Only process if we can access the repo
+
+    def fetch_manifest(path):
+        try:
+            return gh(f"https://api.github.com/repos/{owner}/{repo}/contents/{path}", params={"ref": ref}, raw=True)
+        except Exception:
+            return None
+
+    def repo_status(dep_repo):
+        # Get the status of the dependent repo. Org repos were already
+        # snapshotted with their branch and HEAD, so only others need REST.
+        snapshot = _snapshots.get(f"{owner}/{dep_repo}")
+        if snapshot:
+            dep_branch, dep_sha = snapshot["default_branch"], snapshot["head_sha"]
+        else:
+            dep_branch = default_branch(owner, dep_repo)
+            if not dep_branch:  # Only process if we can access the repo
+                return None
             dep_sha = get_head_sha(owner, dep_repo, dep_branch)
-            if dep_sha:
-                dependencies["repos"].append({
-                    "name": dep_repo,
-                    "branch": dep_branch,
-                    "sha": dep_sha[:7],
-                    "url": f"https://github.com/{owner}/{dep_repo}"
-                })    # Check package.json
+        if not dep_sha:
+            return None
+        return {
+            "name": dep_repo,
+            "branch": dep_branch,
+            "sha": dep_sha[:7],
+            "url": f"https://github.com/{owner}/{dep_repo}"
+        }
+
+    # Manifests and cross-repo dependencies are independent fetches
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        repo_deps = executor.submit(get_repo_dependencies, owner, repo, ref)
+        package_json, pyproject, requirements = executor.map(
+            fetch_manifest, ("package.json", "pyproject.toml", "requirements.txt"))
+        dependencies["repos"] = [d for d in executor.map(repo_status, repo_deps.result()) if d]
+
+    # Collect (name, current version) pairs first, then look them all up at once
+    node = []
+    python = []
+
+    # Check package.json
     try:
-        data = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/package.json", params={"ref": ref})
-        if data:
-            content = json.loads(base64.b64decode(data["content"]).decode("utf-8"))
+        if package_json:
+            content = json_loads(package_json)
             deps = content.get("dependencies", {})
             dev_deps = content.get("devDependencies", {})
-            
             for name, version in {**deps, **dev_deps}.items():
                 # Clean up version string
-                version = version.lstrip("^~=")
-                latest = get_latest_npm_version(name)
-                status = compare_versions(version, latest)
-                dependencies["node"].append({
-                    "name": name,
-                    "current": version,
-                    "latest": latest,
-                    "status": status
-                })
-                # Rate limiting
-                time.sleep(0.1)
+                node.append((name, version.lstrip("^~=")))
     except Exception:
         pass
 
     # Check pyproject.toml
     try:
-        data = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/pyproject.toml", params={"ref": ref})
-        if data:
-            content = tomli.loads(base64.b64decode(data["content"]).decode("utf-8"))
+        if pyproject:
+            content = tomli.loads(pyproject)
             deps = content.get("project", {}).get("dependencies", [])
             dev_deps = content.get("project", {}).get("optional-dependencies", {}).get("dev", [])
-            
             for dep in [*deps, *dev_deps]:
                 # Parse requirement string (e.g., "requests>=2.25.1")
-                match = re.match(r"([^<>=~!]+)(?:[<>=~!]+([^,]+))?", dep)
+                match = REQUIREMENT_RE.match(dep)
                 if match:
-                    name = match.group(1).strip()
-                    version = match.group(2).strip() if match.group(2) else None
-                    latest = get_latest_pypi_version(name)
-                    status = compare_versions(version, latest)
-                    dependencies["python"].append({
-                        "name": name,
-                        "current": version,
-                        "latest": latest,
-                        "status": status
-                    })
-                    # Rate limiting
-                    time.sleep(0.1)
+                    python.append((match.group(1).strip(), match.group(2).strip() if match.group(2) else None))
     except Exception:
         pass
 
     # Check requirements.txt
     try:
-        data = gh(f"https://api.github.com/repos/{owner}/{repo}/contents/requirements.txt", params={"ref": ref})
-        if data:
-            content = base64.b64decode(data["content"]).decode("utf-8")
-            for line in content.splitlines():
+        if requirements:
+            seen = {name for name, _ in python}
+            for line in requirements.splitlines():
                 line = line.strip()
                 if line and not line.startswith("#"):
-                    match = re.match(r"([^<>=~!]+)(?:[<>=~!]+([^,]+))?", line)
+                    match = REQUIREMENT_RE.match(line)
                     if match:
                         name = match.group(1).strip()
-                        version = match.group(2).strip() if match.group(2) else None
-                        latest = get_latest_pypi_version(name)
-                        status = compare_versions(version, latest)
                         # Don't add duplicates from pyproject.toml
-                        if not any(d["name"] == name for d in dependencies["python"]):
-                            dependencies["python"].append({
-                                "name": name,
-                                "current": version,
-                                "latest": latest,
-                                "status": status
-                            })
-                            # Rate limiting
-                            time.sleep(0.1)
+                        if name not in seen:
+                            seen.add(name)
+                            python.append((name, match.group(2).strip() if match.group(2) else None))
     except Exception:
         pass
 
+    # Registry lookups run concurrently; REGISTRY_WORKERS bounds the load on PyPI/npm
+    if node or python:
+        with ThreadPoolExecutor(max_workers=REGISTRY_WORKERS) as executor:
+            node_latest = executor.map(get_latest_npm_version, [name for name, _ in node])
+            python_latest = executor.map(get_latest_pypi_version, [name for name, _ in python])
+            for kind, pairs, latest_versions in (("node", node, node_latest), ("python", python, python_latest)):
+                for (name, version), latest in zip(pairs, latest_versions):
+                    dependencies[kind].append({
+                        "name": name,
+                        "current": version,
+                        "latest": latest,
+                        "status": compare_versions(version, latest)
+                    })
+
     return dependencies
 
-def detect_version(owner, repo, ref):
+def list_paths(owner, repo, ref):
+    """Map every path in the repo to its tree entry, or None if the tree is incomplete.
+
+    This is the same recursive tree the submodule scan reads, so a repo's
+    tree is only ever listed once per run.
+    """
+    tree = gh(f"https://api.github.com/repos/{owner}/{repo}/git/trees/{ref}", params={"recursive": 1})
+    if not tree or tree.get("truncated"):
+        return None
+    return {item["path"]: item for item in tree.get("tree", [])}
+
+def blob_version(path, blob_sha, read):
+    """Version held by a blob, calling read() only for blobs not seen before.
+
+    Identical files across repos share a blob sha, so each is parsed once.
+    A FETCH_FAILED from read() is passed on without being cached.
+    """
+    if not blob_sha:
+        return read()
+    # Blobs are immutable, but the parser depends on the file name
+    key = f"{blob_sha}:{path.rsplit('/', 1)[-1].lower()}"
+    for cache in (_blob_version_cache, _previous_blob_version_cache):
+        if key in cache:
+            _blob_version_cache[key] = cache[key]
+            return cache[key]
+    v = read()
+    if v is not FETCH_FAILED:
+        _blob_version_cache[key] = v
+    return v
+
+def read_blob_version(owner, repo, path, ref, blob_sha):
+    """read_file_version(), skipping the fetch when this blob was parsed before."""
+    return blob_version(path, blob_sha, lambda: read_file_version(owner, repo, path, ref))
+
+def package_init_paths(paths):
+    """Top-level package __init__.py files (pkg/ or src/pkg/) that may hold __version__."""
+    found = []
+    for p in sorted(paths):
+        parts = p.split("/")
+        if parts[-1] != "__init__.py" or len(parts) < 2 or parts[-2].startswith("test"):
+            continue
+        if len(parts) == 2 or (len(parts) == 3 and parts[0] == "src"):
+            found.append(p)
+    return found
+
+def probe_version_files(owner, repo, ref, ordered, tree_only=False):
+    """([version, path] from the first version file found in `ordered`, or [], complete).
+
+    Files are probed in waves, each one concurrently: the language's preferred
+    files and PRIMARY_VERSION_PATHS, then the rest of `ordered`, then any other
+    package __init__.py the tree shows. A wave only runs if the ones before it
+    found nothing, and the first hit in priority order wins. `complete` is
+    False if a file ahead of the result couldn't be fetched, so the result
+    may not be the right one. With tree_only=True only the __init__.py wave
+    runs, for callers that already read `ordered` some other way.
+    """
+    split = max((i + 1 for i, p in enumerate(ordered) if p not in SECONDARY_VERSION_PATHS), default=0)
+    waves = [] if tree_only else [ordered[:split], ordered[split:]]
+    paths = list_paths(owner, repo, ref)
+    if paths is not None:
+        waves.append([p for p in package_init_paths(paths) if p not in ordered])
+        waves = [[p for p in wave if p in paths and paths[p].get("size", 0) <= MAX_VERSION_FILE_SIZE]
+                 for wave in waves]
+
+    complete = True
+    for candidates in waves:
+        if not candidates:
+            continue
+        with ThreadPoolExecutor(max_workers=min(4, len(candidates))) as executor:
+            futures = [(p, executor.submit(read_blob_version, owner, repo, p, ref,
+                                           (paths or {}).get(p, {}).get("sha")))
+                       for p in candidates]
+            for p, future in futures:
+                v = future.result()
+                if v is FETCH_FAILED:
+                    complete = False
+                elif v:
+                    for _, pending in futures:
+                        pending.cancel()
+                    return [v, p], complete
+    return [], complete
+
+def detect_version(owner, repo, ref, language=None):
     """Try to detect version from various files."""
     try:
-        # First try version files
-        for p in VERSION_PATHS:
-            v = read_file_version(owner, repo, p, ref)
-            if v:
-                return v, p
+        # First try version files, likeliest for the repo's language first,
+        # skipping paths the tree says don't exist
+        preferred = LANGUAGE_VERSION_PATHS.get(language, [])
+        ordered = preferred + [p for p in VERSION_PATHS if p not in preferred]
+
+        # The GraphQL snapshot already holds every version file and the newest tag
+        snapshot = branch_snapshot(owner, repo, ref)
+        if snapshot:
+            for p in ordered:
+                if p not in snapshot["files"]:
+                    continue
+                v = blob_version(p, snapshot["blobs"].get(p),
+                                 lambda: parse_version_file(p, snapshot["files"][p]))
+                if v:
+                    return v, p
+            # Package __init__.py files have no fixed path for the query to
+            # name, so they come from the tree as on the REST path
+            found, _ = probe_version_files(owner, repo, ref, ordered, tree_only=True)
+            if found:
+                return tuple(found)
+            if snapshot["latest_tag"]:
+                return snapshot["latest_tag"], "git tag (fallback)"
+            return None, "access denied/not found"
+
+        # Version files only change with a commit, so a probe result (hit or
+        # miss) is reused from the previous run while HEAD hasn't moved. A
+        # probe cut short by failed fetches is retried next run instead.
+        sha = get_head_sha(owner, repo, ref)
+        key = f"{owner}/{repo}@{sha}:{language}"
+        found = _version_cache.get(key, _previous_version_cache.get(key)) if sha else None
+        complete = True
+        if found is None:
+            found, complete = probe_version_files(owner, repo, ref, ordered)
+        if sha and complete:
+            _version_cache[key] = found
+        if found:
+            return tuple(found)
         
         # Fall back to git tags
         tags = gh(f"https://api.github.com/repos/{owner}/{repo}/tags", params={"per_page": 1})
@@ -514,34 +1126,40 @@ def detect_version(owner, repo, ref):
         print(f"Error detecting version for {owner}/{repo}: {e}")
     return None, "access denied/not found"
 
-def get_monorepo_test_status():
-    """Get status of all monitored test workflows in the platform-monorepo."""
-    results = {
-        "integration_tests": [],
-        "console_ui_tests": []
-    }
-    
-    for workflow_file in MONITORED_WORKFLOWS["integration"]:
-        status = get_workflow_runs("netboxlabs", "platform-monorepo", workflow_file)
-        if status:
-            results["integration_tests"].append({
-                "name": status["name"],
-                "status": status["status"],
-                "url": status["url"],
-                "updated": status["updated_at"]
-            })
-    
-    for workflow_file in MONITORED_WORKFLOWS["console_ui"]:
-        status = get_workflow_runs("netboxlabs", "platform-monorepo", workflow_file)
-        if status:
-            results["console_ui_tests"].append({
-                "name": status["name"],
-                "status": status["status"],
-                "url": status["url"],
-                "updated": status["updated_at"]
-            })
-    
-    return results
+def get_run_jobs(owner, repo, run):
+    """Jobs of a workflow run, served from the on-disk cache once the run has completed."""
+    completed = run.get("status") == "completed"
+    key = f"{run.get('id')}:{run.get('run_attempt', 1)}"
+    if completed:
+        jobs = _jobs_cache.get(key, _previous_jobs_cache.get(key))
+        if jobs is not None:
+            _jobs_cache[key] = jobs
+            return jobs
+
+    try:
+        jobs = gh(f"https://api.github.com/repos/{owner}/{repo}/actions/runs/{run.get('id')}/jobs",
+                  params={"per_page": 100}).get("jobs", [])
+    except Exception:
+        return []
+    if completed:
+        _jobs_cache[key] = [{f: job.get(f) for f in JOB_FIELDS} for job in jobs]
+    return jobs
+
+def no_test_signal():
+    """Overall placeholder for repos without any test signal."""
+    return {"status": "unknown", "conclusion": None, "html_url": None, "updated_at": None, "updated_at_ts": 0,
+            "label": "Tests", "source": "none", "_prio": priority("unknown", None)}
+
+def stale_signal(r):
+    """Overall placeholder for a stale repo, whose runs aren't fetched."""
+    return {**no_test_signal(), "status": "stale", "html_url": r["html_url"],
+            "updated_at": r.get("pushed_at"), "updated_at_ts": iso_to_epoch(r.get("pushed_at")),
+            "label": f"No push in {STALE_AFTER_DAYS}+ days"}
+
+def is_stale(r):
+    """True if the repo hasn't been pushed to in STALE_AFTER_DAYS."""
+    pushed_at = r.get("pushed_at")
+    return bool(pushed_at) and time.time() - iso_to_epoch(pushed_at) > STALE_AFTER_DAYS * 86400
 
 def latest_test_signals(owner, repo, ref, max_items=12):
     """
@@ -551,509 +1169,260 @@ def latest_test_signals(owner, repo, ref, max_items=12):
     Returns (signals:list, overall:dict)
     each signal: {label, status, conclusion, html_url, updated_at, source}
     """
-    signals = []
+    # Signals are bucketed by label as they're collected, keeping the newest
+    signals = {}
+
+    def add_signal(s):
+        s["_prio"] = priority(s.get("status"), s.get("conclusion"))
+        key = s["label"].strip().lower()
+        current = signals.get(key)
+        if current is None or s["updated_at_ts"] > current["updated_at_ts"]:
+            signals[key] = s
 
     # 1) Workflows that look like tests
+    latest_runs = {}
+    newest_run_sha = None  # commit of the newest run on the branch, if any
+
+    def workflow_signals(wf):
+        name = (wf.get("name") or "")
+        run = latest_runs.get(wf["id"])
+        if run is None:
+            # Not in the recent-runs page; ask for this workflow's latest run directly
+            runs = (gh(f"https://api.github.com/repos/{owner}/{repo}/actions/workflows/{wf['id']}/runs",
+                       params={"branch": ref, "per_page": 1, "exclude_pull_requests": "true"})
+                    or {}).get("workflow_runs", [])
+            if not runs:
+                return []
+            run = runs[0]
+
+        # Try to get job-level signals (matrix jobs => per-project)
+        jobs = get_run_jobs(owner, repo, run)
+
+        found = []
+        for job in jobs:
+            jname = job.get("name","")
+            if classify(jname) == "test":
+                updated_at = job.get("completed_at") or job.get("started_at") or run.get("updated_at")
+                found.append({
+                    "label": jname,
+                    "status": job.get("status"),
+                    "conclusion": job.get("conclusion"),
+                    "html_url": job.get("html_url") or job.get("url"),
+                    "updated_at": updated_at,
+                    "updated_at_ts": iso_to_epoch(updated_at),
+                    "source": "workflow:job",
+                })
+        # If no job matched, fall back to workflow-level run
+        if not found:
+            found.append({
+                "label": name or "Tests",
+                "status": run.get("status"),
+                "conclusion": run.get("conclusion"),
+                "html_url": run.get("html_url"),
+                "updated_at": run.get("updated_at"),
+                "updated_at_ts": iso_to_epoch(run.get("updated_at")),
+                "source": "workflow",
+            })
+        return found
+
     try:
-        wfs = gh(f"https://api.github.com/repos/{owner}/{repo}/actions/workflows").get("workflows", [])
+        wfs = gh_pages(f"https://api.github.com/repos/{owner}/{repo}/actions/workflows",
+                       {"per_page": 100}, key="workflows") or []
+        test_wfs = []
         for wf in wfs:
+            # Disabled workflows don't run any more; their last result is history
+            if wf.get("state", "active") != "active":
+                continue
             name = (wf.get("name") or "")
             path = (wf.get("path") or "")
-            if not (TEST_WORKFLOW_RE.search(name) or TEST_WORKFLOW_RE.search(path)):
+            name_kind = classify(name)
+            if name_kind == "nontest":
                 continue
-            if NON_TEST_HINT.search(name) or NON_TEST_HINT.search(path):
+            path_kind = classify(path)
+            if path_kind == "nontest" or "test" not in (name_kind, path_kind):
                 continue
+            test_wfs.append(wf)
 
-            runs = gh(f"https://api.github.com/repos/{owner}/{repo}/actions/workflows/{wf['id']}/runs",
-                      params={"branch": ref, "per_page": 1}).get("workflow_runs", [])
-            if not runs:
-                continue
-            run = runs[0]
-            run_id = run.get("id")
-
-            # Try to get job-level signals (matrix jobs => per-project)
-            try:
-                jobs = gh(f"https://api.github.com/repos/{owner}/{repo}/actions/runs/{run_id}/jobs",
-                          params={"per_page": 100}).get("jobs", [])
-            except Exception:
-                jobs = []
-
-            added_job = False
-            for job in jobs:
-                jname = job.get("name","")
-                if TEST_WORKFLOW_RE.search(jname) and not NON_TEST_HINT.search(jname):
-                    signals.append({
-                        "label": jname,
-                        "status": job.get("status"),
-                        "conclusion": job.get("conclusion"),
-                        "html_url": job.get("html_url") or job.get("url"),
-                        "updated_at": job.get("completed_at") or job.get("started_at") or run.get("updated_at"),
-                        "source": "workflow:job",
-                    })
-                    added_job = True
-            # If no job matched, fall back to workflow-level run
-            if not added_job:
-                signals.append({
-                    "label": name or "Tests",
-                    "status": run.get("status"),
-                    "conclusion": run.get("conclusion"),
-                    "html_url": run.get("html_url"),
-                    "updated_at": run.get("updated_at"),
-                    "source": "workflow",
-                })
+        # One page of recent runs on the branch usually covers every workflow;
+        # runs come newest first, so keep the first one seen per test workflow.
+        # Everything else is dropped before any jobs are fetched.
+        if test_wfs:
+            test_wf_ids = {wf["id"] for wf in test_wfs}
+            recent = gh(f"https://api.github.com/repos/{owner}/{repo}/actions/runs",
+                        params={"branch": ref, "per_page": 100, "exclude_pull_requests": "true"})
+            for run in (recent or {}).get("workflow_runs", []):
+                if newest_run_sha is None and run.get("head_branch") == ref:
+                    newest_run_sha = run.get("head_sha")
+                if run.get("workflow_id") in test_wf_ids and run.get("head_branch") == ref:
+                    latest_runs.setdefault(run["workflow_id"], run)
+
+            # Fetch jobs for each workflow's latest run concurrently
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(test_wfs))) as executor:
+                for found in executor.map(workflow_signals, test_wfs):
+                    for s in found:
+                        add_signal(s)
     except Exception:
         pass
 
     # 2) Check runs on HEAD (often granular, includes third-party CI)
     try:
-        sha = get_head_sha(owner, repo, ref)
-        if sha:
-            checks = gh(f"https://api.github.com/repos/{owner}/{repo}/commits/{sha}/check-runs",
-                        params={"per_page": 100}).get("check_runs", [])
-            for cr in checks:
-                name = cr.get("name","")
-                if TEST_WORKFLOW_RE.search(name) and not NON_TEST_HINT.search(name):
-                    signals.append({
-                        "label": name,
-                        "status": cr.get("status"),
-                        "conclusion": cr.get("conclusion"),
-                        "html_url": cr.get("html_url") or cr.get("details_url"),
-                        "updated_at": cr.get("completed_at") or cr.get("started_at"),
-                        "source": "checks",
-                    })
+        snapshot = branch_snapshot(owner, repo, ref)
+        # Without the snapshot, the newest run already names the branch head
+        # in nearly every case; only ask /commits when nothing has run
+        if snapshot:
+            sha = snapshot["head_sha"]
+        else:
+            sha = newest_run_sha or get_head_sha(owner, repo, ref)
+        # The snapshot query already brought HEAD's check runs along
+        checks = snapshot["check_runs"] if snapshot else None
+        if checks is None and sha:
+            checks = (gh(f"https://api.github.com/repos/{owner}/{repo}/commits/{sha}/check-runs",
+                         params={"per_page": 100}) or {}).get("check_runs", [])
+        for cr in checks or []:
+            name = cr.get("name","")
+            if classify(name) == "test":
+                updated_at = cr.get("completed_at") or cr.get("started_at")
+                add_signal({
+                    "label": name,
+                    "status": cr.get("status"),
+                    "conclusion": cr.get("conclusion"),
+                    "html_url": cr.get("html_url") or cr.get("details_url"),
+                    "updated_at": updated_at,
+                    "updated_at_ts": iso_to_epoch(updated_at),
+                    "source": "checks",
+                })
     except Exception:
         pass
 
-    # 3) Deduplicate by label, keep the most recent
-    dedup = {}
-    for s in signals:
-        key = s["label"].strip().lower()
-        if key not in dedup or (s.get("updated_at") or "") > (dedup[key].get("updated_at") or ""):
-            dedup[key] = s
-    signals = list(dedup.values())
+    signals = list(signals.values())
 
     # Sort by priority (fail first) and, within the same priority, newest first
-    signals.sort(key=lambda s: s.get("updated_at") or "", reverse=True)  # newest first
-    signals.sort(key=lambda s: priority(s.get("status"), s.get("conclusion")))  # stable sort puts failures first
+    signals.sort(key=lambda s: (s["_prio"], -s["updated_at_ts"]))
     signals = signals[:max_items]
 
-    # Overall = worst (lowest priority value); tie-break by recency
-    if signals:
-        overall = min(signals, key=lambda s: (priority(s.get("status"), s.get("conclusion")), -(s.get("updated_at") is not None)))
-    else:
-        overall = {"status": "unknown", "conclusion": None, "html_url": None, "updated_at": None, "label": "Tests", "source": "none"}
+    # Overall = worst (lowest priority value), newest within it, which the
+    # sort above already put first
+    overall = signals[0] if signals else no_test_signal()
 
     return signals, overall
 
+def process_repo(r):
+    """Build the card for a single repo."""
+    repo = r["name"]
+    # The repo listing already carries the default branch
+    ref = r.get("default_branch") or default_branch(ORG, repo)
+    # Make sure the GraphQL snapshot exists before the lookups below share it
+    repo_snapshot(ORG, repo)
+
+    # Version, test and dependency lookups are independent call trees.
+    # Stale repos have no recent CI, so their runs aren't fetched at all.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        version = executor.submit(detect_version, ORG, repo, ref, r.get("language"))
+        tests = None if is_stale(r) else executor.submit(latest_test_signals, ORG, repo, ref, max_items=12)
+        deps = executor.submit(get_dependencies, ORG, repo, ref)
+        ver, vsrc = version.result()
+        subtests, overall = tests.result() if tests else ([], stale_signal(r))
+        dependencies = deps.result()
+
+    # Resolve display state once here rather than per render in the template
+    overall_status = overall.get("conclusion") or overall.get("status") or "unknown"
+    
+    # Count outdated dependencies
+    outdated = {
+        "python": len([d for d in dependencies["python"] if d["status"] == -1]),
+        "node": len([d for d in dependencies["node"] if d["status"] == -1])
+    }
+    
+    return {
+        "repo": repo,
+        "default_branch": ref,
+        "version": ver or "—",
+        "version_source": vsrc or "n/a",
+        "overall": overall,
+        "overall_status": overall_status,
+        "card_class": card_class(overall_status),
+        "subtests": subtests,
+        "has_tests": bool(subtests),
+        "html_url": r["html_url"],
+        "dependencies": dependencies,
+        "outdated_deps": outdated
+    }
+
 def build_cards():
     """Build cards for all repos with their test statuses and versions."""
+    # Archived, disabled, forked and empty repos have nothing of their own to
+    # report, so they're dropped before any per-repo call is made
+    repos = [r for r in list_repos(ORG)
+             if not (r.get("archived") or r.get("disabled") or r.get("fork")
+                     or r.get("size", 1) == 0 or r["name"] == ".github")]
+
+    # Seed the branch cache from the listing, so dependency lookups between
+    # org repos don't need a /repos/{owner}/{repo} call of their own
+    expires_at = time.time() + BRANCH_CACHE_TTL
+    for r in repos:
+        if r.get("default_branch"):
+            _branch_cache[f"{ORG}/{r['name']}"] = {"default_branch": r["default_branch"], "expires_at": expires_at}
+
+    # Branch, HEAD, tag and version files for all repos in a few batched queries
+    prefetch_snapshots(ORG, [r["name"] for r in repos])
+
+    # Repos are independent, so fetch them concurrently
     items = []
-    for r in list_repos(ORG):
-        repo = r["name"]
-        if r.get("archived") or repo == ".github":
-            continue
-        ref = default_branch(ORG, repo)
-        ver, vsrc = detect_version(ORG, repo, ref)
-        subtests, overall = latest_test_signals(ORG, repo, ref, max_items=12)
-        dependencies = get_dependencies(ORG, repo, ref)
-        
-        # Count outdated dependencies
-        outdated = {
-            "python": len([d for d in dependencies["python"] if d["status"] == -1]),
-            "node": len([d for d in dependencies["node"] if d["status"] == -1])
-        }
-        
-        items.append({
-            "repo": repo,
-            "default_branch": ref,
-            "version": ver or "—",
-            "version_source": vsrc or "n/a",
-            "overall": overall,
-            "subtests": subtests,
-            "has_tests": bool(subtests),
-            "html_url": r["html_url"],
-            "dependencies": dependencies,
-            "outdated_deps": outdated
-        })
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(process_repo, r) for r in repos]
+        for future in as_completed(futures):
+            items.append(future.result())
 
     # Order repo cards:
     # 1) Repos WITH tests first, then those without
     # 2) Within "has tests": failing → in_progress → success → unknown
     # 3) Newer updates first
     # 4) Finally A–Z by name (stable tie-breaker)
-    items.sort(key=lambda it: it["repo"].lower())
-    items.sort(key=lambda it: it["overall"].get("updated_at") or "", reverse=True)
-    items.sort(key=lambda it: priority(it["overall"].get("status"), it["overall"].get("conclusion")))
-    items.sort(key=lambda it: 0 if it["has_tests"] else 1)
+    items.sort(key=lambda it: (
+        0 if it["has_tests"] else 1,
+        it["overall"]["_prio"],
+        -it["overall"]["updated_at_ts"],
+        it["repo"].lower(),
+    ))
 
     return items
 
-def render_dashboard():
-    """Generate the HTML dashboard."""
-    # Get both platform-monorepo specific tests and all repo cards
-    monorepo_tests = get_monorepo_test_status()
-    repo_cards = build_cards()
+# Templates are compiled once per process, and their bytecode is kept under
+# .cache/ so later runs skip compiling them from source at all. Bytecode is
+# keyed by template source only, so bump the subdirectory whenever the
+# Environment options below change
+JINJA_CACHE_DIR = CACHE_DIR / "jinja" / "v2"
+JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader("templates"),
+    autoescape=True, trim_blocks=True, lstrip_blocks=True, auto_reload=False, cache_size=-1,
+    bytecode_cache=FileSystemBytecodeCache(str(JINJA_CACHE_DIR)),
+)
+# Lets templates colour individual test signals the same way as cards
+TEMPLATE_ENV.filters["card_class"] = card_class
 
-    template = Template("""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>NetBox Labs Build Radiator</title>
-        <meta charset="utf-8">
-        <meta http-equiv="refresh" content="120">
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <style>
-            body { 
-                font-family: -apple-system, system-ui, BlinkMacSystemFont, "Segoe UI", Roboto; 
-                margin: 2rem;
-                line-height: 1.5;
-                color: #24292e;
-                background: #f6f8fa;
-            }
-            .container { 
-                max-width: 1400px; 
-                margin: 0 auto; 
-                padding: 0 1rem;
-            }
-            .section { 
-                margin-bottom: 2rem;
-                background: white;
-                border-radius: 6px;
-                padding: 1rem;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.12);
-            }
-            .grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fill, minmax(400px, 1fr));
-                gap: 1rem;
-                margin-top: 1rem;
-            }
-            h1 { 
-                color: #24292e;
-                font-size: 2em;
-                margin-bottom: 1rem;
-            }
-            h2 { 
-                color: #586069;
-                font-size: 1.5em;
-                border-bottom: 2px solid #eaecef;
-                padding-bottom: 0.3em;
-            }
-            .workflow, .repo-card { 
-                padding: 1rem;
-                border-radius: 6px;
-                border: 1px solid #eaecef;
-                transition: all 0.2s ease;
-                height: 100%;
-                display: flex;
-                flex-direction: column;
-                gap: 0.5rem;
-            }
-            .workflow:hover, .repo-card:hover {
-                box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-                transform: translateY(-2px);
-            }
-            .test-header {
-                color: #6e7681;
-                font-size: 0.9em;
-                text-transform: uppercase;
-                letter-spacing: 0.05em;
-            }
-            .test-name {
-                font-size: 1.1em;
-                margin: 0.25rem 0;
-            }
-            .test-status {
-                margin: 0.5rem 0;
-            }
-            /* Card background colors */
-            .repo-card.success { 
-                background-color: #f0fff4;
-                border-color: #98e3b3;
-            }
-            .repo-card.failure { 
-                background-color: #fff5f5;
-                border-color: #feb2b2;
-            }
-            .repo-card.pending, .repo-card.in_progress { 
-                background-color: #fffaf0;
-                border-color: #fbd38d;
-            }
-            .repo-card.skipped, .repo-card.unknown { 
-                background-color: #f7fafc;
-                border-color: #cbd5e0;
-            }
-            
-            /* Workflow item colors */
-            .workflow.success { 
-                background-color: #dcffe4;
-                border-color: #31c48d;
-            }
-            .workflow.failure { 
-                background-color: #ffe5e5;
-                border-color: #f05252;
-            }
-            .workflow.pending, .workflow.in_progress { 
-                background-color: #feecdc;
-                border-color: #ff8a4c;
-            }
-            .workflow.skipped, .workflow.unknown { 
-                background-color: #f3f4f6;
-                border-color: #9ca3af;
-            }
-            .timestamp { 
-                color: #6a737d;
-                font-size: 0.875rem;
-                margin-top: 0.5rem;
-            }
-            a { 
-                color: #0366d6;
-                text-decoration: none;
-            }
-            a:hover { 
-                text-decoration: underline;
-            }
-            .status-badge {
-                display: inline-block;
-                padding: 0.25em 0.6em;
-                font-size: 0.75rem;
-                font-weight: 500;
-                border-radius: 12px;
-                text-transform: capitalize;
-            }
-            .status-success { background-color: #dcffe4; color: #0a3622; }
-            .status-failure { background-color: #ffe5e5; color: #3c0d0d; }
-            .status-pending { background-color: #fff3dc; color: #3c2a0d; }
-            .status-unknown { background-color: #f0f1f3; color: #1a202c; }
-            
-            .deps-section {
-                margin-top: 0.5rem;
-                font-size: 0.9em;
-            }
-            .deps-badge {
-                display: inline-block;
-                padding: 0.15em 0.4em;
-                font-size: 0.75rem;
-                font-weight: 500;
-                border-radius: 4px;
-                margin-right: 0.5rem;
-            }
-            .deps-ok { background-color: #dcffe4; color: #0a3622; }
-            .deps-outdated { background-color: #ffe5e5; color: #3c0d0d; }
-            .deps-header {
-                color: #6e7681;
-                font-size: 0.9em;
-                margin-top: 0.5rem;
-            }
-            .deps-list {
-                margin: 0.5rem 0;
-                font-family: monaco, monospace;
-                font-size: 0.85em;
-            }
-            .deps-item {
-                display: flex;
-                justify-content: space-between;
-                padding: 0.1rem 0;
-            }
-            .deps-outdated-text {
-                color: #e11d48;
-            }
-            .deps-current-text {
-                color: #059669;
-            }
-            .version-tag {
-                display: inline-block;
-                padding: 0.25em 0.6em;
-                font-size: 0.75rem;
-                font-weight: 500;
-                border-radius: 12px;
-                background-color: #e1e4e8;
-                color: #24292e;
-                margin-left: 0.5rem;
-            }
-            .subtest {
-                margin-left: 1rem;
-                font-size: 0.9em;
-                padding: 0.5rem;
-                border-left: 2px solid #eaecef;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🔍 NetBox Labs Build Radiator</h1>
-            <div class="nav-links" style="margin: 1rem 0;">
-                <a href="dependencies.html" style="color: #58a6ff; text-decoration: none;">View Dependencies Dashboard</a>
-            </div>
-            
-            <div class="section">
-                <h2>🚀 Platform Monorepo Tests</h2>
-                <div class="grid">
-                    {% set all_tests = [] %}
-                    {% for test in monorepo_tests.integration_tests %}
-                        {% set _ = all_tests.append({
-                            'type': 'Integration Test',
-                            'name': test.name,
-                            'url': test.url,
-                            'status': test.status,
-                            'updated': test.updated,
-                            'priority': 0 if test.status == 'failure' else (1 if test.status in ['in_progress', 'pending'] else (2 if test.status == 'success' else 3))
-                        }) %}
-                    {% endfor %}
-                    {% for test in monorepo_tests.console_ui_tests %}
-                        {% set _ = all_tests.append({
-                            'type': 'Console UI Test',
-                            'name': test.name,
-                            'url': test.url,
-                            'status': test.status,
-                            'updated': test.updated,
-                            'priority': 0 if test.status == 'failure' else (1 if test.status in ['in_progress', 'pending'] else (2 if test.status == 'success' else 3))
-                        }) %}
-                    {% endfor %}
-                    {% set sorted_tests = all_tests|sort(attribute='priority') %}
-                    {% for test in sorted_tests %}
-                        <div class="workflow {{ test.status }}">
-                            <div class="test-header">
-                                <strong>{{ test.type }}</strong>
-                            </div>
-                            <div class="test-name">
-                                <a href="{{ test.url }}">{{ test.name }}</a>
-                            </div>
-                            <div class="test-status">
-                                <span class="status-badge status-{{ test.status }}">{{ test.status }}</span>
-                            </div>
-                            <div class="timestamp">Last updated: {{ test.updated }}</div>
-                        </div>
-                    {% endfor %}
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>📦 All Repositories</h2>
-                <div class="grid">
-                    {% for card in repo_cards %}
-                        {% set overall_status = card.overall.conclusion or card.overall.status or 'unknown' %}
-                        {% if overall_status == 'success' %}
-                            {% set card_class = 'success' %}
-                        {% elif overall_status in ['failure', 'timed_out', 'cancelled', 'action_required'] %}
-                            {% set card_class = 'failure' %}
-                        {% elif overall_status in ['in_progress', 'queued', 'pending'] %}
-                            {% set card_class = 'pending' %}
-                        {% else %}
-                            {% set card_class = 'unknown' %}
-                        {% endif %}
-                        <div class="repo-card {{ card_class }}">
-                            <div class="repo-header">
-                                <strong><a href="{{ card.html_url }}">{{ card.repo }}</a></strong>
-                                <span class="version-tag">{{ card.version }}</span>
-                                {% if card.overall.html_url %}
-                                    <a href="{{ card.overall.html_url }}" class="status-badge status-{{ overall_status }}">
-                                        {{ card.overall.label }}
-                                    </a>
-                                {% endif %}
-                            </div>
-                        
-                        {% if card.subtests %}
-                            <div class="subtests">
-                                {% for test in card.subtests %}
-                                    <div class="subtest">
-                                        <a href="{{ test.html_url }}">{{ test.label }}</a>
-                                        <span class="status-badge status-{{ test.status or test.conclusion or 'unknown' }}">
-                                            {{ test.status or test.conclusion or 'unknown' }}
-                                        </span>
-                                        {% if test.updated_at %}
-                                            <div class="timestamp">{{ test.updated_at }}</div>
-                                        {% endif %}
-                                    </div>
-                                {% endfor %}
-                            </div>
-                        {% endif %}
-                        
-                        {% if card.dependencies.python or card.dependencies.node or card.dependencies.repos %}
-                            <div class="deps-section">
-                                {% if card.dependencies.repos %}
-                                    <div class="deps-header"><strong>Repository Dependencies</strong></div>
-                                    <div class="deps-list">
-                                        {% for dep in card.dependencies.repos %}
-                                            <div class="deps-item">
-                                                <a href="{{ dep.url }}" target="_blank">{{ dep.name }}</a>
-                                                <span class="commit-sha">{{ dep.sha }}</span>
-                                            </div>
-                                        {% endfor %}
-                                    </div>
-                                {% endif %}
-                                
-                                {% if card.dependencies.python %}
-                                    <div class="deps-header"><strong>Python Dependencies</strong></div>
-                                    {% if card.outdated_deps.python > 0 %}
-                                        <span class="deps-badge deps-outdated">{{ card.outdated_deps.python }} outdated</span>
-                                    {% else %}
-                                        <span class="deps-badge deps-ok">Up to date</span>
-                                    {% endif %}
-                                    <div class="deps-list">
-                                        {% for dep in card.dependencies.python %}
-                                            {% if dep.status == -1 %}
-                                            <div class="deps-item">
-                                                <span>{{ dep.name }}</span>
-                                                <span>
-                                                    <span class="deps-outdated-text">{{ dep.current }}</span> →
-                                                    <span class="deps-current-text">{{ dep.latest }}</span>
-                                                </span>
-                                            </div>
-                                            {% endif %}
-                                        {% endfor %}
-                                    </div>
-                                {% endif %}
-                                
-                                {% if card.dependencies.node %}
-                                    <div class="deps-header"><strong>Node Dependencies</strong></div>
-                                    {% if card.outdated_deps.node > 0 %}
-                                        <span class="deps-badge deps-outdated">{{ card.outdated_deps.node }} outdated</span>
-                                    {% else %}
-                                        <span class="deps-badge deps-ok">Up to date</span>
-                                    {% endif %}
-                                    <div class="deps-list">
-                                        {% for dep in card.dependencies.node %}
-                                            {% if dep.status == -1 %}
-                                            <div class="deps-item">
-                                                <span>{{ dep.name }}</span>
-                                                <span>
-                                                    <span class="deps-outdated-text">{{ dep.current }}</span> →
-                                                    <span class="deps-current-text">{{ dep.latest }}</span>
-                                                </span>
-                                            </div>
-                                            {% endif %}
-                                        {% endfor %}
-                                    </div>
-                                {% endif %}
-                            </div>
-                        {% endif %}
-                    </div>
-                {% endfor %}
-            </div>
-            
-            <div class="timestamp">
-                Generated at {{ generation_time }} · Auto-refreshes every 2 minutes
-            </div>
-        </div>
-    </body>
-    </html>
-    """)
-    
-    html = template.render(
-        monorepo_tests=monorepo_tests,
-        repo_cards=repo_cards,
-        generation_time=datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-    )
-    
-    # Create dist directory if it doesn't exist
-    dist_dir = Path("dist")
-    dist_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Write index.html to the dist directory for GitHub Pages compatibility
-    output_path = dist_dir / "index.html"
-    output_path.write_text(html)
-    print(f"Dashboard generated at {output_path.absolute()}")
+def write_if_changed(path, chunks):
+    """Stream rendered chunks to path atomically; leave the file alone if unchanged.
+
+    Readers never see a half-written page, and a render that fails partway
+    leaves neither a truncated page nor its temp file behind in dist/.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    digest = hashlib.blake2b()
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            for chunk in chunks:
+                digest.update(chunk.encode("utf-8"))
+                f.write(chunk)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if path.exists() and hashlib.blake2b(path.read_bytes()).digest() == digest.digest():
+        tmp_path.unlink()
+        return False
+    os.replace(tmp_path, path)
+    return True
 
 def render_dashboards():
     """Generate and write both dashboard HTMLs."""
@@ -1063,29 +1432,21 @@ def render_dashboards():
     # Build repo cards
     repo_cards = build_cards()
     
-    # Sort cards by test status (failures first) for main dashboard
-    test_cards = sorted(repo_cards, key=lambda x: 
-        min([priority(run["status"], run.get("conclusion")) 
-            for run in x.get("test_runs", [])]
-            if x.get("test_runs") else [3]))
+    # build_cards() already orders cards by test status (failures first)
+    test_cards = repo_cards
     
     # Sort cards by name for dependencies dashboard
     dep_cards = sorted(repo_cards, key=lambda x: x["repo"])
     
     # Load templates
-    with open("templates/dependencies.html", "r", encoding="utf-8") as f:
-        deps_template = Template(f.read())
-    
-    with open("templates/dashboard.html", "r", encoding="utf-8") as f:
-        main_template = Template(f.read())
+    deps_template = TEMPLATE_ENV.get_template("dependencies.html")
+    main_template = TEMPLATE_ENV.get_template("dashboard.html")
     
-    # Render main dashboard
-    with open("dist/index.html", "w", encoding="utf-8") as f:
-        f.write(main_template.render(cards=test_cards))
+    # Render main dashboard (streamed chunk by chunk into the file)
+    write_if_changed("dist/index.html", main_template.generate(cards=test_cards))
     
     # Render dependencies dashboard
-    with open("dist/dependencies.html", "w", encoding="utf-8") as f:
-        f.write(deps_template.render(cards=dep_cards))
+    write_if_changed("dist/dependencies.html", deps_template.generate(cards=dep_cards))
 
 if __name__ == "__main__":
     render_dashboards()